@@ -48,19 +48,21 @@ async def upload_and_transcribe(
         logger.info(f"Received and saved file: {temp_audio_path}")
 
         # Initialize status for polling
-        set_transcription_result(unique_id, {"status": "processing"})
+        set_transcription_result(unique_id, {"status": "processing"}, temp_audio_path)
 
         # Define a callback function to update the global results dict
         def update_result_callback(result_data):
             set_transcription_result(unique_id, result_data)
 
         # Add the transcription task to background
-        background_tasks.add_task(transcribe_audio_task, temp_audio_path, update_result_callback)
+        background_tasks.add_task(transcribe_audio_task, temp_audio_path, update_result_callback, unique_id)
 
         return {"id": unique_id, "status": "processing"}
 
     except Exception as e:
         logger.error(f"Error handling file upload or initiating transcription: {e}")
+        if get_transcription_result(unique_id):
+            set_transcription_result(unique_id, {"status": "failed", "error": str(e)})
         # Clean up if an error occurs before the background task starts
         if os.path.exists(temp_audio_path):
             os.remove(temp_audio_path)
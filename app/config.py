@@ -7,6 +7,13 @@ import os
 UPLOAD_DIR = "uploaded_audio"
 MODEL_SIZE = "base"  # Or "small", "medium", "large-v3", etc.
 
+# Job Journal Configuration
+# Kept inside UPLOAD_DIR so it lives on the same persistent volume as the audio
+JOB_JOURNAL_PATH = os.path.join(UPLOAD_DIR, ".jobs.sqlite3")
+JOB_JOURNAL_RETENTION_SECONDS = 7 * 24 * 60 * 60  # Forget finished jobs after a week
+JOB_MAX_ATTEMPTS = 2  # Times a job may start transcribing before recovery marks it failed
+MAX_CONCURRENT_TRANSCRIPTIONS = 1  # Jobs transcribing at once; the rest wait in line
+
 # Llama Configuration
 LLAMA_MODEL_ID = "TheBloke/Llama-2-7B-Chat-GGUF"  # More accessible model
 LLAMA_MODEL_BASENAME = "llama-2-7b-chat.Q4_K_M.gguf"  # GGUF quantized version
@@ -5,6 +5,7 @@ import logging
 from fastapi import FastAPI
 from .api import transcription, conversation, health
 from .services.model_loader import load_models
+from .services.transcription import recover_transcription_jobs
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,8 +26,9 @@ app.include_router(health.router)
 @app.on_event("startup")
 async def startup_event():
     """
-    Load models on startup
+    Load models and recover interrupted transcription jobs on startup
     """
     logger.info("Loading models...")
     models_status = load_models()
     logger.info(f"Models loaded: {models_status}")
+    recover_transcription_jobs()
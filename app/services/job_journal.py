@@ -0,0 +1,139 @@
+# app/services/job_journal.py
+# Durable, append-only journal of transcription job state transitions
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from ..config import JOB_JOURNAL_PATH, JOB_JOURNAL_RETENTION_SECONDS
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Single shared connection. All writes currently happen on the event-loop thread
+# (result callbacks run after asyncio.to_thread returns); the lock keeps
+# check_same_thread=False safe should writes ever move off that thread.
+_connection = None
+_lock = threading.Lock()
+
+def init_journal():
+    """
+    Open the journal database, creating the schema if needed
+    """
+    global _connection
+    with _lock:
+        if _connection is not None:
+            return
+        os.makedirs(os.path.dirname(JOB_JOURNAL_PATH) or ".", exist_ok=True)
+        connection = sqlite3.connect(JOB_JOURNAL_PATH, check_same_thread=False, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    audio_path TEXT,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_job_events_task ON job_events (task_id, seq)")
+        except sqlite3.Error:
+            connection.close()
+            raise
+        _connection = connection
+        logger.info(f"Job journal opened at {JOB_JOURNAL_PATH}")
+
+def _append_event(task_id: str, status: str, result: dict, audio_path: str = None):
+    """
+    Append a single event to the journal, swallowing and logging any failure
+    """
+    try:
+        if _connection is None:
+            init_journal()
+        with _lock:
+            _connection.execute(
+                "INSERT INTO job_events (task_id, status, audio_path, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (task_id, status, audio_path, json.dumps(result), time.time())
+            )
+    except (sqlite3.Error, OSError) as e:
+        # The journal is best-effort; never fail a request because of it
+        logger.error(f"Failed to record job state '{status}' for {task_id}: {e}")
+
+def record_job_state(task_id: str, result: dict, audio_path: str = None):
+    """
+    Append a state transition for a task to the journal
+    """
+    _append_event(task_id, result.get("status"), result, audio_path)
+
+def record_job_started(task_id: str, audio_path: str):
+    """
+    Record that Whisper is about to start transcribing a task.
+    These events are counted to cap how often a job that keeps
+    crashing the process is retried.
+    """
+    _append_event(task_id, "started", {"status": "processing"}, audio_path)
+
+def load_latest_job_states():
+    """
+    Return the latest journaled state of every task as a list of
+    (task_id, status, audio_path, result, attempts) tuples.
+    The audio path is taken from the most recent event that recorded one,
+    and attempts is the number of times transcription of the task has started.
+    """
+    if _connection is None:
+        init_journal()
+    with _lock:
+        rows = _connection.execute(
+            """
+            SELECT e.task_id, e.status,
+                   (SELECT a.audio_path FROM job_events a
+                    WHERE a.task_id = e.task_id AND a.audio_path IS NOT NULL
+                    ORDER BY a.seq DESC LIMIT 1),
+                   e.result,
+                   (SELECT COUNT(*) FROM job_events r
+                    WHERE r.task_id = e.task_id AND r.status = 'started')
+            FROM job_events e
+            JOIN (SELECT task_id, MAX(seq) AS seq FROM job_events GROUP BY task_id) latest
+              ON e.seq = latest.seq
+            """
+        ).fetchall()
+    return [
+        (task_id, status, audio_path, json.loads(result), attempts)
+        for task_id, status, audio_path, result, attempts in rows
+    ]
+
+def prune_journal():
+    """
+    Drop every event of tasks whose latest state is terminal and older than
+    the retention window, keeping the journal (and recovery time) bounded.
+    Returns the number of deleted events.
+    """
+    if _connection is None:
+        init_journal()
+    cutoff = time.time() - JOB_JOURNAL_RETENTION_SECONDS
+    with _lock:
+        cursor = _connection.execute(
+            """
+            DELETE FROM job_events WHERE task_id IN (
+                SELECT e.task_id FROM job_events e
+                JOIN (SELECT task_id, MAX(seq) AS seq FROM job_events GROUP BY task_id) latest
+                  ON e.seq = latest.seq
+                WHERE e.status IN ('completed', 'failed') AND e.created_at < ?
+            )
+            """,
+            (cutoff,)
+        )
+    return cursor.rowcount
+
+def is_journal_file(path: str):
+    """
+    Check whether a path belongs to the journal database (including its WAL/SHM files)
+    """
+    return os.path.basename(path).startswith(os.path.basename(JOB_JOURNAL_PATH))
@@ -3,8 +3,11 @@
 
 import os
 import asyncio
+import sqlite3
 import logging
 from .model_loader import get_whisper_model
+from .job_journal import init_journal, record_job_state, record_job_started, load_latest_job_states, prune_journal, is_journal_file
+from ..config import UPLOAD_DIR, JOB_MAX_ATTEMPTS, MAX_CONCURRENT_TRANSCRIPTIONS
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -12,20 +15,40 @@ logger = logging.getLogger(__name__)
 # In-memory storage for transcription results (for polling)
 transcription_results = {}
 
-async def transcribe_audio_task(audio_path: str, result_callback: callable):
+# Strong references to re-enqueued tasks so they are not garbage collected mid-run
+recovered_tasks = set()
+
+# Limits how many jobs transcribe at once, so only jobs actually in flight
+# are blamed when the process crashes. Created lazily inside the running loop.
+transcription_semaphore = None
+
+def get_transcription_semaphore():
+    """
+    Get the semaphore limiting concurrent transcriptions
+    """
+    global transcription_semaphore
+    if transcription_semaphore is None:
+        transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+    return transcription_semaphore
+
+async def transcribe_audio_task(audio_path: str, result_callback: callable, task_id: str = None):
     """
     Asynchronously performs the transcription and calls a callback with the result.
     This is designed to run in a background task, allowing the main API to respond quickly.
+    When a task ID is given, the start of the transcription is recorded in the job journal.
     """
     try:
         whisper_model = get_whisper_model()
         if whisper_model is None:
             raise RuntimeError("Whisper model not loaded.")
 
-        logger.info(f"Starting transcription for {audio_path}...")
-        # Whisper's transcribe method is synchronous, so run it in a thread pool
-        # to not block the FastAPI event loop. asyncio.to_thread is perfect for this.
-        result = await asyncio.to_thread(whisper_model.transcribe, audio_path)
+        async with get_transcription_semaphore():
+            logger.info(f"Starting transcription for {audio_path}...")
+            if task_id is not None:
+                record_job_started(task_id, audio_path)
+            # Whisper's transcribe method is synchronous, so run it in a thread pool
+            # to not block the FastAPI event loop. asyncio.to_thread is perfect for this.
+            result = await asyncio.to_thread(whisper_model.transcribe, audio_path)
         transcription_text = result["text"]
         logger.info(f"Transcription complete for {audio_path}.")
         result_callback({"status": "completed", "transcription": transcription_text})
@@ -44,8 +67,79 @@ def get_transcription_result(task_id: str):
     """
     return transcription_results.get(task_id)
 
-def set_transcription_result(task_id: str, result: dict):
+def set_transcription_result(task_id: str, result: dict, audio_path: str = None):
     """
-    Set the transcription result for a task
+    Set the transcription result for a task and record it in the job journal
     """
     transcription_results[task_id] = result
+    record_job_state(task_id, result, audio_path)
+
+def recover_transcription_jobs():
+    """
+    Rebuild transcription state from the job journal after a restart.
+    Finished jobs are restored for polling, unfinished jobs whose audio still
+    exists are re-enqueued (unless they already started JOB_MAX_ATTEMPTS
+    times, so an upload that keeps crashing the process cannot cause a
+    restart loop), the rest are marked as failed, and audio files no
+    unfinished job refers to are deleted.
+    If the journal cannot be read, recovery is skipped and the server starts
+    with no previous results.
+    Must be called from a running event loop.
+    """
+    summary = {"restored": 0, "requeued": 0, "failed": 0, "orphans_removed": 0}
+    pending_paths = set()
+    loop = asyncio.get_running_loop()
+
+    try:
+        init_journal()
+        pruned = prune_journal()
+        if pruned:
+            logger.info(f"Pruned {pruned} expired job journal entries.")
+        job_states = load_latest_job_states()
+    except (sqlite3.Error, OSError) as e:
+        # Without the journal every audio file would look orphaned, so skip the sweep too
+        logger.error(f"Job journal unavailable, skipping transcription job recovery: {e}")
+        return summary
+
+    for task_id, status, audio_path, result, attempts in job_states:
+        if status in ("completed", "failed"):
+            transcription_results[task_id] = result
+            summary["restored"] += 1
+        elif attempts >= JOB_MAX_ATTEMPTS:
+            # Leave the audio to the orphan sweep below
+            logger.error(f"Giving up on {task_id} after {attempts} interrupted attempts.")
+            set_transcription_result(task_id, {
+                "status": "failed",
+                "error": f"Transcription was interrupted by a restart {attempts} times; giving up."
+            })
+            summary["failed"] += 1
+        elif audio_path and os.path.exists(audio_path):
+            transcription_results[task_id] = result
+            pending_paths.add(os.path.abspath(audio_path))
+
+            def update_result_callback(result_data, task_id=task_id):
+                set_transcription_result(task_id, result_data)
+
+            task = loop.create_task(transcribe_audio_task(audio_path, update_result_callback, task_id))
+            recovered_tasks.add(task)
+            task.add_done_callback(recovered_tasks.discard)
+            summary["requeued"] += 1
+        else:
+            set_transcription_result(task_id, {"status": "failed", "error": "Audio file lost before transcription could complete."})
+            summary["failed"] += 1
+
+    # Sweep audio left behind by interrupted uploads or cleanups
+    with os.scandir(UPLOAD_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file() or is_journal_file(entry.path):
+                continue
+            if os.path.abspath(entry.path) in pending_paths:
+                continue
+            try:
+                os.remove(entry.path)
+                summary["orphans_removed"] += 1
+            except OSError as e:
+                logger.error(f"Failed to remove orphaned file {entry.path}: {e}")
+
+    logger.info(f"Transcription job recovery finished: {summary}")
+    return summary
@@ -0,0 +1,161 @@
+# tests/test_transcription_recovery.py
+# Tests for the transcription job journal and startup recovery
+
+import os
+import time
+import asyncio
+import pytest
+from app.services import job_journal, transcription
+
+class FakeWhisperModel:
+    def transcribe(self, audio_path):
+        return {"text": f"text of {os.path.basename(audio_path)}"}
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """
+    Point the journal and upload directory at a temporary directory
+    and stub out the Whisper model
+    """
+    monkeypatch.setattr(job_journal, "JOB_JOURNAL_PATH", str(tmp_path / ".jobs.sqlite3"))
+    monkeypatch.setattr(job_journal, "_connection", None)
+    monkeypatch.setattr(transcription, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(transcription, "get_whisper_model", lambda: FakeWhisperModel())
+    monkeypatch.setattr(transcription, "transcription_results", {})
+    monkeypatch.setattr(transcription, "transcription_semaphore", None)
+    yield tmp_path
+    if job_journal._connection is not None:
+        job_journal._connection.close()
+
+def write_audio(upload_dir, name):
+    path = upload_dir / name
+    path.write_bytes(b"audio")
+    return str(path)
+
+def recover():
+    """
+    Run startup recovery and wait for every re-enqueued job to finish
+    """
+    async def run():
+        summary = transcription.recover_transcription_jobs()
+        await asyncio.gather(*list(transcription.recovered_tasks))
+        return summary
+    return asyncio.run(run())
+
+def test_recovery_restores_finished_jobs(upload_dir):
+    job_journal.record_job_state("done", {"status": "completed", "transcription": "hello"})
+    job_journal.record_job_state("broken", {"status": "failed", "error": "boom"})
+
+    summary = recover()
+
+    assert summary["restored"] == 2
+    assert transcription.get_transcription_result("done") == {"status": "completed", "transcription": "hello"}
+    assert transcription.get_transcription_result("broken") == {"status": "failed", "error": "boom"}
+
+def test_recovery_requeues_job_with_audio(upload_dir):
+    audio_path = write_audio(upload_dir, "pending.wav")
+    job_journal.record_job_state("pending", {"status": "processing"}, audio_path)
+
+    summary = recover()
+
+    assert summary["requeued"] == 1
+    assert transcription.get_transcription_result("pending") == {
+        "status": "completed",
+        "transcription": "text of pending.wav",
+    }
+    assert not os.path.exists(audio_path)
+
+def test_recovery_fails_job_with_missing_audio(upload_dir):
+    job_journal.record_job_state("lost", {"status": "processing"}, str(upload_dir / "lost.wav"))
+
+    summary = recover()
+
+    assert summary["failed"] == 1
+    assert transcription.get_transcription_result("lost")["status"] == "failed"
+
+def test_recovery_sweeps_orphans_and_keeps_journal(upload_dir):
+    job_journal.record_job_state("done", {"status": "completed", "transcription": "hello"})
+    orphan_path = write_audio(upload_dir, "orphan.wav")
+
+    summary = recover()
+
+    assert summary["orphans_removed"] == 1
+    assert not os.path.exists(orphan_path)
+    remaining = os.listdir(upload_dir)
+    assert ".jobs.sqlite3" in remaining
+    assert all(name.startswith(".jobs.sqlite3") for name in remaining)
+
+def test_prune_journal_removes_only_expired_terminal_jobs(upload_dir):
+    job_journal.record_job_state("old-done", {"status": "completed", "transcription": "hello"})
+    job_journal.record_job_state("old-failed", {"status": "failed", "error": "boom"})
+    job_journal.record_job_state("old-pending", {"status": "processing"}, str(upload_dir / "a.wav"))
+    job_journal.record_job_state("new-done", {"status": "completed", "transcription": "hello"})
+    expired = time.time() - job_journal.JOB_JOURNAL_RETENTION_SECONDS - 60
+    job_journal._connection.execute(
+        "UPDATE job_events SET created_at = ? WHERE task_id LIKE 'old-%'", (expired,)
+    )
+
+    assert job_journal.prune_journal() == 2
+
+    remaining = {task_id for task_id, *_ in job_journal.load_latest_job_states()}
+    assert remaining == {"old-pending", "new-done"}
+
+def test_recovery_gives_up_after_max_attempts(upload_dir, monkeypatch):
+    async def crashing_task(audio_path, result_callback, task_id):
+        # Simulate the process dying mid-transcription: started, but no result and audio left behind
+        job_journal.record_job_started(task_id, audio_path)
+
+    monkeypatch.setattr(transcription, "transcribe_audio_task", crashing_task)
+    audio_path = write_audio(upload_dir, "poison.wav")
+    job_journal.record_job_state("poison", {"status": "processing"}, audio_path)
+    job_journal.record_job_started("poison", audio_path)
+
+    for _ in range(transcription.JOB_MAX_ATTEMPTS - 1):
+        assert recover()["requeued"] == 1
+        assert os.path.exists(audio_path)
+
+    summary = recover()
+
+    assert summary["requeued"] == 0
+    assert summary["failed"] == 1
+    assert summary["orphans_removed"] == 1
+    assert transcription.get_transcription_result("poison")["status"] == "failed"
+    assert not os.path.exists(audio_path)
+
+def test_recovery_only_blames_jobs_that_started(upload_dir):
+    poison_path = write_audio(upload_dir, "poison.wav")
+    waiting_path = write_audio(upload_dir, "waiting.wav")
+    job_journal.record_job_state("poison", {"status": "processing"}, poison_path)
+    job_journal.record_job_state("waiting", {"status": "processing"}, waiting_path)
+    # The poison job crashed the process every time it started, while the
+    # other job was still queued behind it and never started
+    for _ in range(transcription.JOB_MAX_ATTEMPTS):
+        job_journal.record_job_started("poison", poison_path)
+
+    summary = recover()
+
+    assert summary["failed"] == 1
+    assert summary["requeued"] == 1
+    assert transcription.get_transcription_result("poison")["status"] == "failed"
+    assert transcription.get_transcription_result("waiting") == {
+        "status": "completed",
+        "transcription": "text of waiting.wav",
+    }
+
+def test_transcription_records_start_in_journal(upload_dir):
+    audio_path = write_audio(upload_dir, "job.wav")
+    job_journal.record_job_state("job", {"status": "processing"}, audio_path)
+
+    asyncio.run(transcription.transcribe_audio_task(audio_path, lambda result: None, "job"))
+
+    [(_, _, _, _, attempts)] = job_journal.load_latest_job_states()
+    assert attempts == 1
+
+def test_recovery_survives_corrupt_journal(upload_dir):
+    (upload_dir / ".jobs.sqlite3").write_bytes(b"this is not a database" * 100)
+    audio_path = write_audio(upload_dir, "pending.wav")
+
+    summary = recover()
+
+    assert summary == {"restored": 0, "requeued": 0, "failed": 0, "orphans_removed": 0}
+    assert os.path.exists(audio_path)